@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+
+import argparse
+import functools
+import heapq
+import itertools
+import mmap
+import multiprocessing
+import os
+import struct
+
+from game import Game
+
+class Catalog():
+    """
+    Catalog of every distinct 14-tile winning hand under the rules of
+    Game.reduce: one eye plus four melds, where honors only form eyes and
+    three-of-a-kinds and simples additionally form sequences of three.
+
+    A hand is keyed by how many of each Tile it holds after Game.filter_hand,
+    so a Kong is catalogued as the three-of-a-kind it leaves behind and any
+    hand can be looked up by filtering it first. As Game.reduce lets each
+    honor eye overwrite the last, it also wins with four melds and several
+    honor eyes; such a hand is looked up with all but its first honor eye
+    dropped, which keeps lookups in agreement with Game.is_won. Each count is
+    at most 3 and is packed into 2 bits, in the sorted order of
+    Catalog.TILES, making a key a fixed width big-endian record whose byte
+    order is also its numeric order.
+
+    The catalog file is a header followed by the sorted records, so a lookup
+    is a binary search over a memory mapped file.
+    """
+    MAGIC   = b'MJWC'
+    VERSION = 1
+    HEADER  = struct.Struct('>4sHHQ')
+
+    BITS_PER_TILE = 2
+    MAX_COUNT     = Game.SIZE_PONG
+
+    # Every kind of Tile in play, excluding bonuses, in sorted order
+    TILES = sorted(set(tile for tile in Game.all_tiles()
+                       if not tile[0].startswith('bonus')))
+    TILE_INDEX  = {tile: idx for idx, tile in enumerate(TILES)}
+    RECORD_SIZE = (len(TILES) * BITS_PER_TILE + 7) // 8
+
+    SIMPLES = [Game.TILE_SIMPLE_DOT, Game.TILE_SIMPLE_CHAR, Game.TILE_SIMPLE_BAMBOO]
+    HONORS  = [Game.TILE_HONOR_WIND, Game.TILE_HONOR_DRAGON]
+
+    def __init__(self, path):
+        """
+        Open a catalog file written by Catalog.generate
+        @param  path str the catalog file
+        """
+        self.path = path
+        if os.path.getsize(path) < Catalog.HEADER.size:
+            raise RuntimeError('not a catalog file')
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count = Catalog.HEADER.unpack_from(self.data)
+        if magic != Catalog.MAGIC or version != Catalog.VERSION:
+            raise RuntimeError('not a catalog file')
+        if record_size != Catalog.RECORD_SIZE:
+            raise RuntimeError('unexpected record size')
+        if len(self.data) != Catalog.HEADER.size + count * record_size:
+            raise RuntimeError('truncated catalog file')
+        self.count = count
+        return
+
+    def __reduce__(self):
+        # Reopen the file rather than pickling the mapping, so lookups can be
+        # shipped to a process pool
+        return (Catalog, (self.path,))
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        """
+        @param  key int an encoded hand as returned by Catalog.encode
+        @return True if the key is one of the catalogued winning hands
+        """
+        record = key.to_bytes(Catalog.RECORD_SIZE, 'big')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = Catalog.HEADER.size + mid * Catalog.RECORD_SIZE
+            entry = self.data[start:start + Catalog.RECORD_SIZE]
+            if entry < record:
+                lo = mid + 1
+            elif entry > record:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __iter__(self):
+        for idx in range(self.count):
+            start = Catalog.HEADER.size + idx * Catalog.RECORD_SIZE
+            yield int.from_bytes(self.data[start:start + Catalog.RECORD_SIZE], 'big')
+
+    def close(self):
+        self.data.close()
+        return
+
+    #########################
+    # Lookups
+    #########################
+    def is_won(self, player_hand):
+        """
+        Check if a given hand has won by looking it up in the catalog
+        @param  player_hand [Tile] unsorted array of tiles representing a
+                player's entire hand. including flowers and kongs
+        @return True if the hand has won, False if otherwise. Agrees with
+                Game.is_won, including hands with several honor eyes
+        """
+        if len(player_hand) < Game.SIZE_HAND + 1:
+            return False
+        key = Catalog.encode(player_hand)
+        return key is not None and key in self
+
+    def waits(self, player_hand):
+        """
+        Find the tiles that would complete a hand one tile from winning
+        @param  player_hand [Tile] unsorted array of tiles representing a
+                player's entire hand, typically 13 in length
+        @return [Tile] sorted kinds of tile which, once drawn, win the hand
+                according to Game.is_won
+        """
+        result = []
+        for tile in Catalog.TILES:
+            if player_hand.count(tile) >= Game.SIZE_KONG:
+                continue
+            if self.is_won(player_hand + [tile]):
+                result.append(tile)
+        return result
+
+    #########################
+    # Encoding
+    #########################
+    @staticmethod
+    def encode(player_hand):
+        """
+        Encode a hand into its catalog key
+        @param  player_hand [Tile] unsorted array of tiles, including flowers
+                and kongs
+        @return int the key of the hand after Game.filter_hand, with all but
+                the first honor eye dropped as Game.reduce only keeps one, or
+                None if the filtered hand cannot be a winning hand (wrong
+                number of tiles, or too many of one kind)
+        """
+        hand, bonus, kongs = Game.filter_hand(player_hand)
+        key = 0
+        size = 0
+        honor_eye = False
+        for kind in sorted(hand):
+            for value, cnt in sorted(hand[kind].items()):
+                if (kind, value) not in Catalog.TILE_INDEX:
+                    raise ValueError('unknown tile %s' % str((kind, value)))
+                if cnt > Catalog.MAX_COUNT:
+                    return None
+                if kind in Catalog.HONORS and cnt == Game.SIZE_EYE:
+                    if honor_eye:
+                        continue
+                    honor_eye = True
+                key |= cnt << Catalog.shift((kind, value))
+                size += cnt
+        if size != Game.SIZE_HAND + 1:
+            return None
+        return key
+
+    @staticmethod
+    def decode(key):
+        """
+        Decode a catalog key back into a hand
+        @param  key int the catalog key
+        @return [Tile] sorted tiles of the hand
+        """
+        hand = []
+        for tile in Catalog.TILES:
+            cnt = (key >> Catalog.shift(tile)) & ((1 << Catalog.BITS_PER_TILE) - 1)
+            hand += [tile] * cnt
+        return hand
+
+    @staticmethod
+    def shift(tile):
+        """
+        @param  tile Tile
+        @return int the bit offset of the count of tile within a key
+        """
+        return (len(Catalog.TILES) - 1 - Catalog.TILE_INDEX[tile]) * Catalog.BITS_PER_TILE
+
+    #########################
+    # Enumeration
+    #########################
+    @staticmethod
+    def suits():
+        """
+        @return [([Tile], bool)] the groups of tiles that are reduced
+                independently of each other, each simple type on its own and
+                the honors together, with whether sequences can be formed
+        """
+        result = []
+        for simple in Catalog.SIMPLES:
+            result.append(([(simple, value) for value in range(Game.SIZE_SIMPLE)], True))
+        result.append(([tile for tile in Catalog.TILES if tile[0] in Catalog.HONORS], False))
+        return result
+
+    @staticmethod
+    def suit_table(tiles, sequences):
+        """
+        Enumerate every way a single suit can be divided
+        @param  tiles     [Tile] tiles of the suit, in value order
+        @param  sequences bool whether three consecutive tiles form a meld
+        @return {(int, bool): [int]} for each number of melds and whether the
+                eye is taken from this suit, the sorted distinct keys (of the
+                suit's tiles only) that divide that way
+        """
+        melds = [[idx] * Game.SIZE_PONG for idx in range(len(tiles))]
+        if sequences:
+            melds += [[idx, idx + 1, idx + 2] for idx in range(len(tiles) - 2)]
+
+        table = {}
+        for meld_num in range(Game.SIZE_MELD_NEEDED + 1):
+            for combo in itertools.combinations_with_replacement(melds, meld_num):
+                counts = [0] * len(tiles)
+                for meld in combo:
+                    for idx in meld:
+                        counts[idx] += 1
+                for eye in [None] + list(range(len(tiles))):
+                    hand = list(counts)
+                    if eye is not None:
+                        hand[eye] += Game.SIZE_EYE
+                    if max(hand) > Catalog.MAX_COUNT:
+                        continue
+                    key = 0
+                    for idx, cnt in enumerate(hand):
+                        key |= cnt << Catalog.shift(tiles[idx])
+                    table.setdefault((meld_num, eye is not None), set()).add(key)
+        return {state: sorted(keys) for state, keys in table.items()}
+
+    @staticmethod
+    def compositions():
+        """
+        @return [((int, bool), ...)] every way of spreading four melds and one
+                eye across the suits returned by Catalog.suits; the hands of
+                different compositions never overlap
+        """
+        result = []
+        suit_num = len(Catalog.suits())
+        for meld_nums in itertools.product(range(Game.SIZE_MELD_NEEDED + 1), repeat=suit_num):
+            if sum(meld_nums) != Game.SIZE_MELD_NEEDED:
+                continue
+            for eye in range(suit_num):
+                result.append(tuple((meld_num, idx == eye)
+                                    for idx, meld_num in enumerate(meld_nums)))
+        return result
+
+    @staticmethod
+    def enumerate_composition(composition, tables=None):
+        """
+        Enumerate the winning hands of one composition
+        @param  composition ((int, bool), ...) as returned by
+                Catalog.compositions
+        @param  tables [{(int, bool): [int]}] per suit tables as returned by
+                Catalog.suit_table, computed if not given
+        @return bytes the sorted records of the hands
+        """
+        if tables is None:
+            tables = [Catalog.suit_table(tiles, sequences)
+                      for tiles, sequences in Catalog.suits()]
+        parts = [tables[idx][state] for idx, state in enumerate(composition)]
+        keys = sorted(sum(part) for part in itertools.product(*parts))
+        return b''.join(key.to_bytes(Catalog.RECORD_SIZE, 'big') for key in keys)
+
+    @staticmethod
+    def records(blob):
+        """
+        @param  blob bytes sorted records as returned by
+                Catalog.enumerate_composition
+        @return generator of bytes, each record of the blob in order
+        """
+        for start in range(0, len(blob), Catalog.RECORD_SIZE):
+            yield blob[start:start + Catalog.RECORD_SIZE]
+
+    @staticmethod
+    def generate(path, processes=None, compositions=None):
+        """
+        Enumerate the winning hands across a process pool, one composition per
+        task, and write them out as a catalog file
+        @param  path         str the catalog file to write
+        @param  processes    int the size of the process pool, defaults to the
+                             number of cores
+        @param  compositions [((int, bool), ...)] restrict the catalog to these
+                             compositions, defaults to all of them
+        @return int the number of hands written
+        """
+        if compositions is None:
+            compositions = Catalog.compositions()
+        # The suit tables are shared by every composition, so build them once
+        # rather than in every task
+        tables = [Catalog.suit_table(tiles, sequences)
+                  for tiles, sequences in Catalog.suits()]
+        with multiprocessing.Pool(processes) as pool:
+            blobs = pool.map(functools.partial(Catalog.enumerate_composition, tables=tables),
+                             compositions)
+
+        count = sum(len(blob) for blob in blobs) // Catalog.RECORD_SIZE
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(Catalog.HEADER.pack(Catalog.MAGIC, Catalog.VERSION,
+                                        Catalog.RECORD_SIZE, count))
+            f.writelines(heapq.merge(*[Catalog.records(blob) for blob in blobs]))
+        os.replace(tmp_path, path)
+        return count
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the catalog of every winning hand')
+    parser.add_argument('output', help='the catalog file to write')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='size of the process pool, defaults to the number of cores')
+    args = parser.parse_args()
+
+    count = Catalog.generate(args.output, args.processes)
+    print('wrote %d hands to %s' % (count, args.output))
+    return
+
+if __name__ == '__main__':
+    main()
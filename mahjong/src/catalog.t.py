@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+import importlib
+import itertools
+import os
+import random
+import tempfile
+import unittest
+from game import Game
+import catalog
+from catalog import Catalog
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tables = [Catalog.suit_table(tiles, sequences)
+                       for tiles, sequences in Catalog.suits()]
+        return
+
+    def test_catalog_tiles(self):
+        state = random.getstate()
+        importlib.reload(catalog)
+        self.assertEqual(state, random.getstate(), 'expect importing the catalog to leave random alone')
+
+        self.assertEqual(Game.SIZE_SIMPLE * 3 + Game.SIZE_HONOR_DRAGON + Game.SIZE_HONOR_WIND, len(Catalog.TILES), 'expect 34 kinds of tile')
+        self.assertEqual(9, Catalog.RECORD_SIZE, 'expect 34 two bit counts to fit in 9 bytes')
+        return
+
+    def test_catalog_size(self):
+        self.assertEqual(16, len(self.tables[0][(1, False)]), 'expect 9 pongs and 7 sequences in a simple suit')
+        self.assertEqual(42, len(self.tables[3][(1, True)]), 'expect 7 pongs times 6 other eyes in the honors')
+
+        total = 0
+        for composition in Catalog.compositions():
+            size = 1
+            for idx, state in enumerate(composition):
+                size *= len(self.tables[idx][state])
+            total += size
+        self.assertEqual(8905719, total, 'expect 8905719 distinct winning hands')
+        return
+
+    def test_catalog_complete(self):
+        # Pad every way of holding the dots, and every way of holding the
+        # honors, with three-of-a-kinds and an eye from elsewhere, and expect
+        # Game.is_won to agree with the suit table on all of them
+        padding = {
+            0: ([(Game.TILE_SIMPLE_CHAR, value) for value in [0, 4, 8]] + [(Game.TILE_SIMPLE_BAMBOO, 0)],
+                (Game.TILE_HONOR_WIND, 'east')),
+            3: ([(Game.TILE_SIMPLE_DOT, value) for value in [0, 4, 8]] + [(Game.TILE_SIMPLE_BAMBOO, 0)],
+                (Game.TILE_SIMPLE_CHAR, 0)),
+        }
+        for idx, (pongs, eye) in padding.items():
+            tiles, sequences = Catalog.suits()[idx]
+            table = {state: set(keys) for state, keys in self.tables[idx].items()}
+            for counts in itertools.product(range(Catalog.MAX_COUNT + 1), repeat=len(tiles)):
+                size = sum(counts)
+                meld_num, has_eye = size // Game.SIZE_PONG, size % Game.SIZE_PONG == Game.SIZE_EYE
+                if meld_num > Game.SIZE_MELD_NEEDED or size % Game.SIZE_PONG == 1:
+                    continue
+                hand = []
+                key = 0
+                for tile, cnt in zip(tiles, counts):
+                    hand += [tile] * cnt
+                    key |= cnt << Catalog.shift(tile)
+                for tile in pongs[:Game.SIZE_MELD_NEEDED - meld_num]:
+                    hand += [tile] * Game.SIZE_PONG
+                if not has_eye:
+                    hand += [eye] * Game.SIZE_EYE
+                self.assertEqual(Game.is_won(hand), key in table.get((meld_num, has_eye), set()), hand)
+        return
+
+    def test_catalog_encode(self):
+        hand = [(Game.TILE_SIMPLE_DOT, 0), (Game.TILE_SIMPLE_DOT, 0), (Game.TILE_SIMPLE_DOT, 0),
+                (Game.TILE_SIMPLE_DOT, 2), (Game.TILE_SIMPLE_DOT, 2), (Game.TILE_SIMPLE_DOT, 2),
+                (Game.TILE_SIMPLE_CHAR, 1), (Game.TILE_SIMPLE_CHAR, 1), (Game.TILE_SIMPLE_CHAR, 1),
+                (Game.TILE_SIMPLE_BAMBOO, 1), (Game.TILE_SIMPLE_BAMBOO, 1), (Game.TILE_SIMPLE_BAMBOO, 1),
+                (Game.TILE_HONOR_WIND, 'east'), (Game.TILE_HONOR_WIND, 'east')]
+        self.assertEqual(sorted(hand), Catalog.decode(Catalog.encode(hand)))
+
+        # Expect a kong to be keyed as the three-of-a-kind it leaves behind
+        kong = hand + [(Game.TILE_SIMPLE_DOT, 0), (Game.TILE_BONUS_FLOWER, 'east')]
+        self.assertEqual(Catalog.encode(hand), Catalog.encode(kong))
+
+        self.assertEqual(None, Catalog.encode(hand[1:]))
+        with self.assertRaises(ValueError):
+            Catalog.encode(hand[1:] + [(Game.TILE_SIMPLE_DOT, 9)])
+        return
+
+    def test_catalog_enumerate(self):
+        for composition in Catalog.compositions():
+            size = 1
+            for idx, state in enumerate(composition):
+                size *= len(self.tables[idx][state])
+            if size > 10000:
+                continue
+            blob = Catalog.enumerate_composition(composition, self.tables)
+            keys = [int.from_bytes(record, 'big') for record in Catalog.records(blob)]
+            self.assertEqual(sorted(set(keys)), keys, 'expect sorted distinct hands')
+            for key in random.sample(keys, min(len(keys), 50)):
+                hand = Catalog.decode(key)
+                random.shuffle(hand)
+                self.assertEqual(True, Game.is_won(hand))
+        return
+
+    def test_catalog_lookup(self):
+        compositions = [((4, True), (0, False), (0, False), (0, False)),
+                        ((0, False), (0, False), (0, False), (4, True))]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'hands.cat')
+            count = Catalog.generate(path, 2, compositions)
+            catalog = Catalog(path)
+            self.assertEqual(4088 + 105, count)
+            self.assertEqual(count, len(catalog))
+            self.assertEqual(sorted(catalog), list(catalog))
+
+            for key in catalog:
+                self.assertEqual(True, Game.is_won(Catalog.decode(key)))
+
+            hand = [(Game.TILE_SIMPLE_DOT, 1), (Game.TILE_SIMPLE_DOT, 1),
+                    (Game.TILE_SIMPLE_DOT, 0), (Game.TILE_SIMPLE_DOT, 1), (Game.TILE_SIMPLE_DOT, 2),
+                    (Game.TILE_SIMPLE_DOT, 3), (Game.TILE_SIMPLE_DOT, 4), (Game.TILE_SIMPLE_DOT, 5),
+                    (Game.TILE_SIMPLE_DOT, 6), (Game.TILE_SIMPLE_DOT, 7), (Game.TILE_SIMPLE_DOT, 8),
+                    (Game.TILE_SIMPLE_DOT, 6), (Game.TILE_SIMPLE_DOT, 7), (Game.TILE_SIMPLE_DOT, 8)]
+            self.assertEqual(True, catalog.is_won(hand))
+            self.assertEqual(False, catalog.is_won(hand[1:]))
+            self.assertEqual(True, catalog.is_won(hand + [(Game.TILE_SIMPLE_DOT, 1)]))
+
+            # Expect nine gates to wait on every dot but the ends, which would
+            # form a kong
+            hand = [(Game.TILE_SIMPLE_DOT, value) for value in [0, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 8, 8]]
+            self.assertEqual([(Game.TILE_SIMPLE_DOT, value) for value in range(1, 8)], catalog.waits(hand))
+            for tile in Catalog.TILES:
+                self.assertEqual(Game.is_won(hand + [tile]), tile in catalog.waits(hand))
+
+            # Expect several honor eyes to win as Game.reduce keeps only one
+            pongs = [(Game.TILE_HONOR_DRAGON, value) for value in ['green', 'red', 'white']] * 3 + [(Game.TILE_HONOR_WIND, 'east')] * 3
+            hand = pongs + [(Game.TILE_HONOR_WIND, 'north')] * 2 + [(Game.TILE_HONOR_WIND, 'south')] * 2
+            self.assertEqual(True, Game.is_won(hand))
+            self.assertEqual(True, catalog.is_won(hand))
+            hand += [(Game.TILE_HONOR_WIND, 'west')] * 2 + [(Game.TILE_HONOR_WIND, 'east')]
+            self.assertEqual(True, Game.is_won(hand))
+            self.assertEqual(True, catalog.is_won(hand))
+            hand = pongs + [(Game.TILE_HONOR_WIND, 'north')] * 2 + [(Game.TILE_SIMPLE_DOT, 0)] * 2
+            self.assertEqual(False, Game.is_won(hand))
+            self.assertEqual(False, catalog.is_won(hand))
+            catalog.close()
+        return
+
+    def test_catalog_open_invalid(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'hands.cat')
+            for content in [b'', Catalog.MAGIC, b'x' * Catalog.HEADER.size]:
+                with open(path, 'wb') as f:
+                    f.write(content)
+                with self.assertRaises(RuntimeError):
+                    Catalog(path)
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib
+import multiprocessing
+import random
+import sys
+
+from game import Game
+
+class Fuzz():
+    """
+    Differential fuzzing of a candidate win evaluator against Game.is_won as
+    the oracle.
+
+    A candidate is any picklable callable taking a hand [Tile] and returning
+    whether it has won. Hands are generated in chunks, each from its own seed
+    so a run is reproducible, and the chunks are checked across a process
+    pool. Every hand the candidate disagrees on (or raises on) is shrunk to a
+    minimal counterexample before being reported.
+    """
+    CHUNK_SIZE     = 10000
+    MAX_FAILURES   = 10
+    MIN_HAND_TILES = Game.SIZE_HAND + 1
+
+    # All 144 tiles, and every kind of Tile in sorted order
+    WALL  = sorted(Game.all_tiles())
+    KINDS = sorted(set(WALL))
+    HONOR = [kind for kind in KINDS if kind[0].startswith('honor')]
+    SUITS = [[(simple, value) for value in range(Game.SIZE_SIMPLE)]
+             for simple in [Game.TILE_SIMPLE_DOT, Game.TILE_SIMPLE_CHAR, Game.TILE_SIMPLE_BAMBOO]]
+    BONUS = [kind for kind in KINDS if kind[0].startswith('bonus')]
+
+    #########################
+    # Generators
+    #########################
+    @staticmethod
+    def random_hand(rng):
+        """
+        @param  rng random.Random
+        @return [Tile] 14 to 18 tiles drawn from the wall
+        """
+        return rng.sample(Fuzz.WALL, Fuzz.MIN_HAND_TILES + rng.randrange(5))
+
+    @staticmethod
+    def meld_hand(rng, kinds, sequences, eyes=Game.SIZE_EYE_NEEDED):
+        """
+        Build eyes and four melds from the given kinds of tile, allowing up
+        to four of each kind, so a kind can be split across melds
+        @param  rng       random.Random
+        @param  kinds     [[Tile]] groups of tiles, in value order, to draw from
+        @param  sequences bool whether to form sequences of three
+        @param  eyes      int how many eyes to build
+        @return [Tile] the 12 tiles of the melds and 2 of each eye, unsorted
+        """
+        while True:
+            hand = []
+            for i in range(eyes):
+                group = rng.choice(kinds)
+                hand += [rng.choice(group)] * Game.SIZE_EYE
+            for i in range(Game.SIZE_MELD_NEEDED):
+                group = rng.choice(kinds)
+                start = rng.randrange(len(group))
+                if sequences and start + 2 < len(group) and rng.random() < 0.5:
+                    hand += group[start:start + Game.SIZE_PONG]
+                else:
+                    hand += [group[start]] * Game.SIZE_PONG
+            if all(hand.count(tile) <= Game.SIZE_KONG for tile in hand):
+                rng.shuffle(hand)
+                return hand
+
+    @staticmethod
+    def adversarial_hand(rng):
+        """
+        @param  rng random.Random
+        @return [Tile] a hand that is, or is one change from, a winning hand:
+                mixed suits, a single suit (where kinds get split across melds
+                as in breaking up a kong), all honors, or mixed suits with two
+                or three eyes (which Game.reduce wins on if they are all
+                honors), then possibly with a kong declared, a bonus added, or
+                a tile swapped
+        """
+        mixed = Fuzz.SUITS + [[kind] for kind in Fuzz.HONOR]
+        shape = rng.randrange(4)
+        if shape == 0:
+            hand = Fuzz.meld_hand(rng, mixed, True)
+        elif shape == 1:
+            hand = Fuzz.meld_hand(rng, [rng.choice(Fuzz.SUITS)], True)
+        elif shape == 2:
+            hand = Fuzz.meld_hand(rng, [Fuzz.HONOR], False)
+        else:
+            hand = Fuzz.meld_hand(rng, mixed, True, rng.randint(2, 3))
+
+        if rng.random() < 0.3:
+            pongs = [tile for tile in set(hand) if hand.count(tile) == Game.SIZE_PONG]
+            if pongs:
+                hand.append(rng.choice(pongs))
+        if rng.random() < 0.2:
+            hand += rng.sample(Fuzz.BONUS, 1 + rng.randrange(2))
+        if rng.random() < 0.5:
+            idx = rng.randrange(len(hand))
+            tile = rng.choice(Fuzz.KINDS)
+            if hand.count(tile) < Fuzz.WALL.count(tile):
+                hand[idx] = tile
+        return hand
+
+    @staticmethod
+    def generate(rng):
+        """
+        @param  rng random.Random
+        @return [Tile] a random or an adversarial hand
+        """
+        if rng.random() < 0.2:
+            return Fuzz.random_hand(rng)
+        return Fuzz.adversarial_hand(rng)
+
+    #########################
+    # Checking
+    #########################
+    @staticmethod
+    def evaluate(engine, hand):
+        """
+        @return the result of engine on a copy of hand, or the exception it
+                raised as a string
+        """
+        try:
+            return engine(list(hand))
+        except Exception as e:
+            return 'raised %s' % repr(e)
+
+    @staticmethod
+    def differs(candidate, hand):
+        return Fuzz.evaluate(candidate, hand) != Fuzz.evaluate(Game.is_won, hand)
+
+    @staticmethod
+    def fails(candidate, hand):
+        """
+        @return True if the candidate disagrees on a hand that the generators
+                could have produced, so shrinking never leaves their domain
+        """
+        return len(hand) >= Fuzz.MIN_HAND_TILES and Fuzz.differs(candidate, hand)
+
+    @staticmethod
+    def check_chunk(task):
+        """
+        Generate and check one chunk of hands
+        @param  task (callable, int, int, int) the candidate, the run seed,
+                the chunk index and the number of hands to check
+        @return (int, [[Tile]]) the number of hands checked and the (at most
+                MAX_FAILURES) hands the candidate disagreed on
+        """
+        candidate, seed, idx, cases = task
+        rng = random.Random('%d-%d' % (seed, idx))
+        failures = []
+        for i in range(cases):
+            hand = Fuzz.generate(rng)
+            if Fuzz.differs(candidate, hand) and len(failures) < Fuzz.MAX_FAILURES:
+                failures.append(hand)
+        return cases, failures
+
+    @staticmethod
+    def shrink(candidate, hand):
+        """
+        Greedily shrink a failing hand, by removing tiles, by removing every
+        tile of a kind (so whole eyes and melds go at once), by renaming a kind
+        of tile to one that sorts earlier and is not in the hand, and by
+        replacing single tiles with kinds that sort earlier, for as long as it
+        still fails with at least MIN_HAND_TILES tiles
+        @param  candidate callable
+        @param  hand      [Tile] a hand the candidate disagrees on
+        @return [Tile] sorted minimal hand the candidate disagrees on
+        """
+        hand = sorted(hand)
+        shrunk = True
+        while shrunk:
+            shrunk = False
+            for idx in range(len(hand)):
+                smaller = hand[:idx] + hand[idx + 1:]
+                if Fuzz.fails(candidate, smaller):
+                    hand, shrunk = smaller, True
+                    break
+            if shrunk:
+                continue
+            for old in sorted(set(hand)):
+                smaller = [tile for tile in hand if tile != old]
+                if Fuzz.fails(candidate, smaller):
+                    hand, shrunk = smaller, True
+                    break
+            if shrunk:
+                continue
+            for old in sorted(set(hand)):
+                for kind in Fuzz.KINDS:
+                    if kind >= old:
+                        break
+                    if kind in hand or kind[0].startswith('bonus') != old[0].startswith('bonus'):
+                        continue
+                    smaller = sorted(kind if tile == old else tile for tile in hand)
+                    if Fuzz.fails(candidate, smaller):
+                        hand, shrunk = smaller, True
+                        break
+                if shrunk:
+                    break
+            if shrunk:
+                continue
+            for idx in range(len(hand)):
+                for kind in Fuzz.KINDS:
+                    if kind >= hand[idx]:
+                        break
+                    if hand.count(kind) >= Fuzz.WALL.count(kind):
+                        continue
+                    smaller = sorted(hand[:idx] + [kind] + hand[idx + 1:])
+                    if Fuzz.fails(candidate, smaller):
+                        hand, shrunk = smaller, True
+                        break
+                if shrunk:
+                    break
+        return hand
+
+    @staticmethod
+    def run(candidate, cases, processes=None, seed=0):
+        """
+        Check a candidate against Game.is_won on generated hands
+        @param  candidate callable the picklable evaluator under test
+        @param  cases     int the number of hands to check
+        @param  processes int the size of the process pool, defaults to the
+                          number of cores. 1 checks in this process
+        @param  seed      int the seed the run is reproducible from
+        @return (int, [([Tile], expected, actual)]) the number of hands
+                checked and the distinct minimal counterexamples the first
+                MAX_FAILURES failing hands shrink to
+        """
+        tasks = [(candidate, seed, idx, min(Fuzz.CHUNK_SIZE, cases - start))
+                 for idx, start in enumerate(range(0, cases, Fuzz.CHUNK_SIZE))]
+        if processes == 1:
+            results = list(map(Fuzz.check_chunk, tasks))
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.map(Fuzz.check_chunk, tasks)
+
+        checked = sum(cnt for cnt, failures in results)
+        failures = [hand for cnt, found in results for hand in found]
+        counterexamples = {}
+        for hand in failures[:Fuzz.MAX_FAILURES]:
+            hand = Fuzz.shrink(candidate, hand)
+            counterexamples[tuple(hand)] = (hand,
+                                            Fuzz.evaluate(Game.is_won, hand),
+                                            Fuzz.evaluate(candidate, hand))
+        return checked, [counterexamples[key] for key in sorted(counterexamples)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Fuzz a win evaluator against Game.is_won')
+    engine = parser.add_mutually_exclusive_group(required=True)
+    engine.add_argument('--engine', help='the evaluator under test, as module:function or module:Class.method')
+    engine.add_argument('--catalog', help='test lookups in this catalog file')
+    parser.add_argument('-n', '--cases', type=int, default=1000000,
+                        help='number of hands to check')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='size of the process pool, defaults to the number of cores')
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.catalog:
+        from catalog import Catalog
+        candidate = Catalog(args.catalog).is_won
+    else:
+        module, attrs = args.engine.split(':')
+        candidate = importlib.import_module(module)
+        for attr in attrs.split('.'):
+            candidate = getattr(candidate, attr)
+
+    checked, counterexamples = Fuzz.run(candidate, args.cases, args.processes, args.seed)
+    print('checked %d hands, %d counterexamples' % (checked, len(counterexamples)))
+    for hand, expected, actual in counterexamples:
+        print('%s: expected %s, got %s' % (hand, expected, actual))
+    return 1 if counterexamples else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
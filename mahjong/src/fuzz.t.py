@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import importlib
+import random
+import unittest
+from game import Game
+import fuzz
+from fuzz import Fuzz
+
+def ignore_kongs(player_hand):
+    """
+    A broken evaluator that never lets a hand with a kong win
+    """
+    hand, bonus, kongs = Game.filter_hand(player_hand)
+    return not kongs and Game.reduce(hand)[0]
+
+def single_eye(player_hand):
+    """
+    A broken evaluator that only lets a hand with one eye win
+    """
+    hand, bonus, kongs = Game.filter_hand(player_hand)
+    size = sum(sum(counts.values()) for counts in hand.values())
+    return size == Game.SIZE_HAND + 1 and Game.reduce(hand)[0]
+
+def strict_ignore_kongs(player_hand):
+    """
+    A broken evaluator that never lets a hand with a kong win, and refuses
+    hands too short to have won
+    """
+    if len(player_hand) < Game.SIZE_HAND + 1:
+        raise ValueError('too few tiles')
+    return ignore_kongs(player_hand)
+
+class TestFuzz(unittest.TestCase):
+    def setUp(self):
+        return
+
+    def test_fuzz_import(self):
+        state = random.getstate()
+        importlib.reload(fuzz)
+        self.assertEqual(state, random.getstate(), 'expect importing the harness to leave random alone')
+        return
+
+    def test_fuzz_generate(self):
+        rng = random.Random(0)
+        won = 0
+        for i in range(2000):
+            hand = Fuzz.generate(rng)
+            self.assertEqual(True, len(hand) > Game.SIZE_HAND, 'expect at least 14 tiles')
+            for tile in hand:
+                self.assertEqual(True, hand.count(tile) <= Fuzz.WALL.count(tile), 'expect no more tiles than in the wall')
+            won += Game.is_won(hand)
+        self.assertEqual(True, won > 500, 'expect many generated hands to have won')
+        return
+
+    def test_fuzz_oracle(self):
+        checked, counterexamples = Fuzz.run(Game.is_won, 2000, 1)
+        self.assertEqual(2000, checked)
+        self.assertEqual([], counterexamples)
+        return
+
+    def test_fuzz_shrink(self):
+        checked, counterexamples = Fuzz.run(ignore_kongs, 20000, 2, seed=1)
+        self.assertEqual(20000, checked)
+        self.assertNotEqual([], counterexamples, 'expect the broken evaluator to be caught')
+        for hand, expected, actual in counterexamples:
+            self.assertEqual(Game.SIZE_HAND + 2, len(hand), 'expect a kong and no other extra tiles')
+            self.assertEqual([], [tile for tile in hand if tile[0].startswith('bonus')])
+            self.assertEqual(True, expected)
+            self.assertEqual(False, actual)
+
+        self.assertEqual((checked, counterexamples), Fuzz.run(ignore_kongs, 20000, 1, seed=1), 'expect a run to be reproducible')
+        return
+
+    def test_fuzz_shrink_domain(self):
+        checked, counterexamples = Fuzz.run(strict_ignore_kongs, 20000, 1, seed=1)
+        self.assertNotEqual([], counterexamples, 'expect the broken evaluator to be caught')
+        for hand, expected, actual in counterexamples:
+            self.assertEqual(Game.SIZE_HAND + 2, len(hand), 'expect shrinking to stop at the kong, not an empty hand')
+            self.assertEqual(True, expected)
+            self.assertEqual(False, actual)
+        return
+
+    def test_fuzz_shrink_eyes(self):
+        checked, counterexamples = Fuzz.run(single_eye, 20000, 2, seed=1)
+        self.assertNotEqual([], counterexamples, 'expect the broken evaluator to be caught')
+        for hand, expected, actual in counterexamples:
+            self.assertEqual(Game.SIZE_HAND + 3, len(hand), 'expect four melds and two honor eyes')
+            self.assertEqual(True, expected)
+            self.assertEqual(False, actual)
+        return
+
+if __name__ == '__main__':
+    unittest.main()
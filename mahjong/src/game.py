@@ -57,18 +57,7 @@ class Game():
         """
         Initialize the 144 tiles
         """
-        for simple in [Game.TILE_SIMPLE_DOT, Game.TILE_SIMPLE_BAMBOO, Game.TILE_SIMPLE_CHAR]:
-            for value in range(Game.SIZE_SIMPLE):
-                self.tiles += [(simple, value) for i in range(4)]
-
-        for value in ['east', 'west', 'north', 'south']:
-            self.tiles += [(Game.TILE_HONOR_WIND, value) for i in range(4)]
-            self.tiles += [(Game.TILE_BONUS_FLOWER, value)]
-            self.tiles += [(Game.TILE_BONUS_SEASON, value)]
-
-        for value in ['red', 'green', 'white']:
-            self.tiles += [(Game.TILE_HONOR_DRAGON, value) for i in range(4)]
-
+        self.tiles += Game.all_tiles()
         random.shuffle(self.tiles)
         return
 
@@ -121,6 +110,25 @@ class Game():
     #########################
     # Checks and helpers
     #########################
+    @staticmethod
+    def all_tiles():
+        """
+        @return [Tile] the 144 tiles, unshuffled
+        """
+        tiles = []
+        for simple in [Game.TILE_SIMPLE_DOT, Game.TILE_SIMPLE_BAMBOO, Game.TILE_SIMPLE_CHAR]:
+            for value in range(Game.SIZE_SIMPLE):
+                tiles += [(simple, value) for i in range(4)]
+
+        for value in ['east', 'west', 'north', 'south']:
+            tiles += [(Game.TILE_HONOR_WIND, value) for i in range(4)]
+            tiles += [(Game.TILE_BONUS_FLOWER, value)]
+            tiles += [(Game.TILE_BONUS_SEASON, value)]
+
+        for value in ['red', 'green', 'white']:
+            tiles += [(Game.TILE_HONOR_DRAGON, value) for i in range(4)]
+        return tiles
+
     @staticmethod
     def determine_legal_actions(self):
         """
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib
+import multiprocessing
+import random
+import sys
+
+from card import Card
+
+# Fuzz a score evaluator against Card.getScore
+#   candidate: picklable, [Card] -> (score, score_type)
+#   hands:     5 to 7 distinct cards, seeded per chunk, chunks across cores
+#   failures:  shrunk to the fewest, lowest cards that still disagree
+
+class Fuzz:
+
+    CHUNK_SIZE     = 10000
+    MAX_FAILURES   = 10
+    MIN_HAND_CARDS = 5
+
+    STRAIGHT_LEN = 5
+    DECK = [(number, suit) for number in range(Card.NUM_KINDS)
+                           for suit in range(Card.NUM_SUITS)]
+
+    ###### Generators ######
+    @staticmethod
+    def randomHand(rng):
+    # @param  random.Random
+    # @return [(Int, Int)] 5 to 7 distinct (number, suit) drawn from the deck
+        size = rng.randint(Fuzz.MIN_HAND_CARDS, Card.TOTAL_HAND_CARDS)
+        return rng.sample(Fuzz.DECK, size)
+
+    @staticmethod
+    def adversarialHand(rng):
+    # @param  random.Random
+    # @return [(Int, Int)] 5 to 7 distinct (number, suit) around a flush, a
+    #         straight (including the A-2-3-4-5 wheel and straight flushes)
+    #         or several cards of a kind (quads, full houses, two trips, three
+    #         pairs), filled up with random cards
+        size  = rng.randint(Fuzz.MIN_HAND_CARDS, Card.TOTAL_HAND_CARDS)
+        shape = rng.randrange(3)
+        if shape == 0:
+            suit  = rng.randrange(Card.NUM_SUITS)
+            cards = [(number, suit) for number in
+                     rng.sample(range(Card.NUM_KINDS), rng.randint(Fuzz.STRAIGHT_LEN - 1, size))]
+        elif shape == 1:
+            start   = rng.randrange(-1, Card.NUM_KINDS - Fuzz.STRAIGHT_LEN + 1)
+            numbers = [number % Card.NUM_KINDS for number in range(start, start + Fuzz.STRAIGHT_LEN)]
+            if rng.random() < 0.5:
+                suit  = rng.randrange(Card.NUM_SUITS)
+                cards = [(number, suit) for number in numbers]
+            else:
+                cards = [(number, rng.randrange(Card.NUM_SUITS)) for number in numbers]
+            # Leave a gap in the straight now and then
+            if rng.random() < 0.3:
+                del cards[rng.randrange(len(cards))]
+        else:
+            numbers = rng.sample(range(Card.NUM_KINDS), rng.randint(2, 3))
+            pool    = [(number, suit) for number in numbers for suit in range(Card.NUM_SUITS)]
+            cards   = rng.sample(pool, rng.randint(4, size))
+
+        rest = [card for card in Fuzz.DECK if card not in cards]
+        cards += rng.sample(rest, size - len(cards))
+        rng.shuffle(cards)
+        return cards
+
+    @staticmethod
+    def generate(rng):
+    # @param  random.Random
+    # @return [(Int, Int)] a random or an adversarial hand
+        if rng.random() < 0.2:
+            return Fuzz.randomHand(rng)
+        return Fuzz.adversarialHand(rng)
+
+    ###### Checking ######
+    @staticmethod
+    def evaluate(engine, hand):
+    # @param  callable, [(Int, Int)]
+    # @return The result of engine on the hand, or the exception it raised as
+    #         a string
+        try:
+            return engine([Card(number, suit) for number, suit in hand])
+        except Exception as e:
+            return "raised " + repr(e)
+
+    @staticmethod
+    def differs(candidate, hand):
+    # @param  callable, [(Int, Int)]
+    # @return True if candidate and Card.getScore disagree on the hand
+        return Fuzz.evaluate(candidate, hand) != Fuzz.evaluate(Card.getScore, hand)
+
+    @staticmethod
+    def fails(candidate, hand):
+    # @param  callable, [(Int, Int)]
+    # @return True if candidate and Card.getScore disagree on a hand of at
+    #         least MIN_HAND_CARDS, so shrinking never leaves the generators'
+    #         domain
+        return len(hand) >= Fuzz.MIN_HAND_CARDS and Fuzz.differs(candidate, hand)
+
+    @staticmethod
+    def checkChunk(task):
+    # @param  (callable, Int, Int, Int). The candidate, the run seed, the chunk
+    #         index and the number of hands to check
+    # @return Int, [[(Int, Int)]]. The number of hands checked and the (at most
+    #         MAX_FAILURES) hands the candidate disagreed on
+        candidate, seed, idx, cases = task
+        rng      = random.Random("%d-%d" % (seed, idx))
+        failures = []
+        for i in range(cases):
+            hand = Fuzz.generate(rng)
+            if Fuzz.differs(candidate, hand) and len(failures) < Fuzz.MAX_FAILURES:
+                failures.append(hand)
+        return cases, failures
+
+    @staticmethod
+    def shrink(candidate, hand):
+    # @param  callable, [(Int, Int)] a hand the candidate disagrees on
+    # @return [(Int, Int)] sorted minimal hand the candidate disagrees on
+    # @note   Greedily removes cards, then lowers the number or suit of single
+    #         cards, for as long as the hand still fails with at least
+    #         MIN_HAND_CARDS cards
+        hand   = sorted(hand)
+        shrunk = True
+        while shrunk:
+            shrunk = False
+            for idx in range(len(hand)):
+                smaller = hand[:idx] + hand[idx + 1:]
+                if Fuzz.fails(candidate, smaller):
+                    hand, shrunk = smaller, True
+                    break
+            if shrunk:
+                continue
+            for idx in range(len(hand)):
+                for card in Fuzz.DECK:
+                    if card >= hand[idx]:
+                        break
+                    if card in hand:
+                        continue
+                    smaller = sorted(hand[:idx] + [card] + hand[idx + 1:])
+                    if Fuzz.fails(candidate, smaller):
+                        hand, shrunk = smaller, True
+                        break
+                if shrunk:
+                    break
+        return hand
+
+    @staticmethod
+    def run(candidate, cases, processes=None, seed=0):
+    # @param  callable, Int, Int, Int. The picklable evaluator under test, the
+    #         number of hands to check, the size of the process pool (defaults
+    #         to the number of cores, 1 checks in this process) and the seed
+    #         the run is reproducible from
+    # @return Int, [([(Int, Int)], expected, actual)]. The number of hands
+    #         checked and the distinct minimal counterexamples the first
+    #         MAX_FAILURES failing hands shrink to
+        tasks = [(candidate, seed, idx, min(Fuzz.CHUNK_SIZE, cases - start))
+                 for idx, start in enumerate(range(0, cases, Fuzz.CHUNK_SIZE))]
+        if processes == 1:
+            results = list(map(Fuzz.checkChunk, tasks))
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.map(Fuzz.checkChunk, tasks)
+
+        checked  = sum(cnt for cnt, found in results)
+        failures = [hand for cnt, found in results for hand in found]
+        counterexamples = {}
+        for hand in failures[:Fuzz.MAX_FAILURES]:
+            hand = Fuzz.shrink(candidate, hand)
+            counterexamples[tuple(hand)] = (hand,
+                                            Fuzz.evaluate(Card.getScore, hand),
+                                            Fuzz.evaluate(candidate, hand))
+        return checked, [counterexamples[key] for key in sorted(counterexamples)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz a score evaluator against Card.getScore")
+    parser.add_argument("engine", help="the evaluator under test, as module:function or module:Class.method")
+    parser.add_argument("-n", "--cases", type=int, default=1000000,
+                        help="number of hands to check")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="size of the process pool, defaults to the number of cores")
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    module, attrs = args.engine.split(":")
+    candidate = importlib.import_module(module)
+    for attr in attrs.split("."):
+        candidate = getattr(candidate, attr)
+
+    checked, counterexamples = Fuzz.run(candidate, args.cases, args.processes, args.seed)
+    print("checked %d hands, %d counterexamples" % (checked, len(counterexamples)))
+    for hand, expected, actual in counterexamples:
+        print("%s: expected %s, got %s" % (hand, expected, actual))
+    return 1 if counterexamples else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
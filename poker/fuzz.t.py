@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import random
+import unittest
+from card import Card
+from fuzz import Fuzz
+
+def firstFiveCards(cards):
+# A broken evaluator that only scores the first five cards
+    return Card.getScore(cards[:5])
+
+def strictFlushOffByOne(cards):
+# A broken evaluator that misscores flushes, and refuses hands of other than
+# 5 to 7 cards
+    if not Fuzz.MIN_HAND_CARDS <= len(cards) <= Card.TOTAL_HAND_CARDS:
+        raise ValueError("expected 5 to 7 cards")
+    score, score_type = Card.getScore(cards)
+    if score_type == "flush":
+        score -= 1
+    return score, score_type
+
+class TestFuzz(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_generatedHandsAreValid(self):
+        rng = random.Random(0)
+        for i in range(2000):
+            hand = Fuzz.generate(rng)
+            self.assertEqual(True, Fuzz.MIN_HAND_CARDS <= len(hand) <= Card.TOTAL_HAND_CARDS)
+            self.assertEqual(len(hand), len(set(hand)), "expect distinct cards")
+
+    def test_generatedHandsCoverScoreTypes(self):
+        rng = random.Random(0)
+        score_types = set(Card.getScore([Card(number, suit) for number, suit in Fuzz.generate(rng)])[1]
+                          for i in range(2000))
+        self.assertEqual(set(["high_card", "one_pair", "two_pairs", "three_of_a_kind",
+                              "straight", "flush", "full_house", "four_of_a_kind",
+                              "straight_flush"]), score_types)
+
+    def test_oracleAgreesWithItself(self):
+        checked, counterexamples = Fuzz.run(Card.getScore, 2000, 1)
+        self.assertEqual(2000, checked)
+        self.assertEqual([], counterexamples)
+
+    def test_brokenEvaluatorIsShrunk(self):
+        checked, counterexamples = Fuzz.run(firstFiveCards, 20000, 2, seed=1)
+        self.assertEqual(20000, checked)
+        self.assertNotEqual([], counterexamples, "expect the broken evaluator to be caught")
+        for hand, expected, actual in counterexamples:
+            self.assertEqual(6, len(hand), "expect one card past the first five")
+        self.assertEqual((checked, counterexamples),
+                         Fuzz.run(firstFiveCards, 20000, 1, seed=1),
+                         "expect a run to be reproducible")
+
+    def test_shrinkingStaysWithinHandSizes(self):
+        checked, counterexamples = Fuzz.run(strictFlushOffByOne, 20000, 1, seed=1)
+        self.assertNotEqual([], counterexamples, "expect the broken evaluator to be caught")
+        for hand, expected, actual in counterexamples:
+            self.assertEqual(Fuzz.MIN_HAND_CARDS, len(hand),
+                             "expect shrinking to stop at a five card flush, not an empty hand")
+            self.assertEqual("flush", expected[1])
+
+if __name__ == '__main__':
+    unittest.main()